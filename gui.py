@@ -1,12 +1,28 @@
 import time
-import threading
+import collections
+import importlib
 import tkinter as tk
+from random import Random
 from tkinter import ttk, messagebox
-from trading import Trader  # adjust import path if needed
-from strategies import (
-    SafeStrategy, ModerateStrategy, AggressiveStrategy,
-    MomentumStrategy, MeanReversionStrategy
-)
+
+# The scalping loop is driven by the Twisted reactor when main.py runs it via tksupport.
+# Without Twisted (or when the reactor isn't running) it falls back to Tk's own `after` timer.
+_reactor_installed = False
+try:
+    from twisted.internet import reactor
+    from twisted.internet.task import LoopingCall
+    _reactor_installed = True
+except ImportError:
+    reactor = None  # type: ignore
+    LoopingCall = None  # type: ignore
+
+# Dedicated RNG for the simulated order results in TradingPage.place_order
+_ORDER_RNG = Random()
+
+
+def _fmt_amount(value) -> str:
+    # Account figures may still be None (e.g. margin isn't reported by the API yet)
+    return "–" if value is None else f"{value:.2f}"
 
 
 class MainApplication(tk.Tk):
@@ -19,26 +35,55 @@ class MainApplication(tk.Tk):
         self.columnconfigure(0, weight=1)
 
         self.settings = settings
+        # Imported here so the window isn't held up by the OpenApiPy/protobuf import chain at module load
+        from trading import Trader  # adjust import path if needed
         self.trader = Trader(self.settings)
 
-        container = ttk.Frame(self)
-        container.grid(row=0, column=0, sticky="nsew")
-        container.rowconfigure(0, weight=1)
-        container.columnconfigure(0, weight=1)
+        self._container = ttk.Frame(self)
+        self._container.grid(row=0, column=0, sticky="nsew")
+        self._container.rowconfigure(0, weight=1)
+        self._container.columnconfigure(0, weight=1)
 
+        # Pages are built on first show; only SettingsPage is needed for the first paint.
+        # Only the visible page stays gridded so hidden pages drop out of geometry passes.
         self.pages = {}
-        for Page in (SettingsPage, TradingPage):
-            page = Page(container, self)
-            page.grid(row=0, column=0, sticky="nsew")
-            self.pages[Page] = page
-
+        self._current_page = None
         self.show_page(SettingsPage)
 
     def show_page(self, page_cls):
-        self.pages[page_cls].tkraise()
+        page = self.pages.get(page_cls)
+        if page is None:
+            page = page_cls(self._container, self)
+            self.pages[page_cls] = page
+        if self._current_page is not page:
+            if self._current_page is not None:
+                self._current_page.grid_remove()
+            page.grid(row=0, column=0, sticky="nsew")
+            self._current_page = page
+        on_show = getattr(page, "on_show", None)
+        if on_show is not None:
+            on_show()
 
 
 class SettingsPage(ttk.Frame):
+    # (label, attribute, variable class, Entry `show` option) per row of the login form
+    LOGIN_FIELDS = (
+        ("Host:", "host_var", tk.StringVar, ""),
+        ("Port:", "port_var", tk.IntVar, ""),
+        ("SenderCompID:", "sender_var", tk.StringVar, ""),
+        ("TargetCompID:", "target_var", tk.StringVar, ""),
+        ("Password:", "password_var", tk.StringVar, "*"),
+    )
+    # (label, attribute) per row of the read-only account summary
+    ACCOUNT_FIELDS = (
+        ("Account ID:", "account_id_var"),
+        ("Balance:", "balance_var"),
+        ("Equity:", "equity_var"),
+        ("Margin:", "margin_var"),
+    )
+    CONNECT_POLL_MS = 200
+    CONNECT_TIMEOUT_S = 15.0
+
     def __init__(self, parent, controller):
         super().__init__(parent, padding=10)
         self.controller = controller
@@ -49,52 +94,29 @@ class SettingsPage(ttk.Frame):
         creds.grid(row=0, column=0, sticky="ew", pady=(0, 10))
         creds.columnconfigure(1, weight=1)
 
-        ttk.Label(creds, text="Host:").grid(row=0, column=0, sticky="w", padx=(0,5))
-        self.host_var = tk.StringVar()
-        ttk.Entry(creds, textvariable=self.host_var).grid(row=0, column=1, sticky="ew")
-
-        ttk.Label(creds, text="Port:").grid(row=1, column=0, sticky="w", padx=(0,5))
-        self.port_var = tk.IntVar()
-        ttk.Entry(creds, textvariable=self.port_var).grid(row=1, column=1, sticky="ew")
-
-        ttk.Label(creds, text="SenderCompID:").grid(row=2, column=0, sticky="w", padx=(0,5))
-        self.sender_var = tk.StringVar()
-        ttk.Entry(creds, textvariable=self.sender_var).grid(row=2, column=1, sticky="ew")
-
-        ttk.Label(creds, text="TargetCompID:").grid(row=3, column=0, sticky="w", padx=(0,5))
-        self.target_var = tk.StringVar()
-        ttk.Entry(creds, textvariable=self.target_var).grid(row=3, column=1, sticky="ew")
-
-        ttk.Label(creds, text="Password:").grid(row=4, column=0, sticky="w", padx=(0,5))
-        self.password_var = tk.StringVar()
-        ttk.Entry(creds, textvariable=self.password_var, show="*").grid(row=4, column=1, sticky="ew")
+        for row, (text, attr, var_cls, show) in enumerate(self.LOGIN_FIELDS):
+            var = var_cls()
+            setattr(self, attr, var)
+            ttk.Label(creds, text=text).grid(row=row, column=0, sticky="w", padx=(0,5))
+            ttk.Entry(creds, textvariable=var, show=show).grid(row=row, column=1, sticky="ew")
 
         # --- Account Summary ---
         acct = ttk.Labelframe(self, text="Account Summary", padding=10)
         acct.grid(row=1, column=0, sticky="ew", pady=(0,10))
         acct.columnconfigure(1, weight=1)
 
-        self.account_id_var = tk.StringVar(value="–")
-        ttk.Label(acct, text="Account ID:").grid(row=0, column=0, sticky="w", padx=(0,5))
-        ttk.Label(acct, textvariable=self.account_id_var).grid(row=0, column=1, sticky="w")
-
-        self.balance_var = tk.StringVar(value="–")
-        ttk.Label(acct, text="Balance:").grid(row=1, column=0, sticky="w", padx=(0,5))
-        ttk.Label(acct, textvariable=self.balance_var).grid(row=1, column=1, sticky="w")
-
-        self.equity_var = tk.StringVar(value="–")
-        ttk.Label(acct, text="Equity:").grid(row=2, column=0, sticky="w", padx=(0,5))
-        ttk.Label(acct, textvariable=self.equity_var).grid(row=2, column=1, sticky="w")
-
-        self.margin_var = tk.StringVar(value="–")
-        ttk.Label(acct, text="Margin:").grid(row=3, column=0, sticky="w", padx=(0,5))
-        ttk.Label(acct, textvariable=self.margin_var).grid(row=3, column=1, sticky="w")
+        for row, (text, attr) in enumerate(self.ACCOUNT_FIELDS):
+            var = tk.StringVar(value="–")
+            setattr(self, attr, var)
+            ttk.Label(acct, text=text).grid(row=row, column=0, sticky="w", padx=(0,5))
+            ttk.Label(acct, textvariable=var).grid(row=row, column=1, sticky="w")
 
         # --- Actions & Status ---
         actions = ttk.Frame(self)
         actions.grid(row=2, column=0, sticky="ew", pady=(10,0))
         ttk.Button(actions, text="Save Settings", command=self.save_settings).pack(side="left", padx=5)
-        ttk.Button(actions, text="Connect", command=self.attempt_connection).pack(side="left", padx=5)
+        self.connect_button = ttk.Button(actions, text="Connect", command=self.attempt_connection)
+        self.connect_button.pack(side="left", padx=5)
 
         self.status = ttk.Label(self, text="Disconnected", anchor="center")
         self.status.grid(row=3, column=0, sticky="ew", pady=(5,0))
@@ -111,36 +133,54 @@ class SettingsPage(ttk.Frame):
         self.save_settings()
         t = self.controller.trader
 
-        # Re-init FIX params on the Trader
+        # The Trader reads its connection parameters from the settings object
         t.settings = self.controller.settings
-        t.fix_host = t.settings.fix_host
-        t.fix_port = t.settings.fix_port
-        t.fix_sender_comp_id = t.settings.fix_sender_comp_id
-        t.fix_target_comp_id = t.settings.fix_target_comp_id
-        t.fix_password = t.settings.fix_password
 
+        # Trader.connect() only starts the client; authorization completes in its callbacks.
+        # Poll for the result from the Tk loop rather than blocking the UI waiting for it.
+        self.connect_button.config(state="disabled")
+        self.status.config(text="Connecting…", foreground="")
         if t.connect():
-            self._extracted_from_attempt_connection_14(t)
+            self._connect_deadline = time.monotonic() + self.CONNECT_TIMEOUT_S
+            self.after(self.CONNECT_POLL_MS, self._poll_connection)
         else:
             _, msg = t.get_connection_status()
-            messagebox.showerror("Connection Failed", msg)
-            self.status.config(text=f"Failed: {msg}", foreground="red")
+            self._on_connect_failed(msg)
+
+    def _poll_connection(self):
+        t = self.controller.trader
+        if t.wait_for_logon(0):
+            connected, msg = t.get_connection_status()
+            if connected:
+                self._on_connected(t)
+            else:
+                self._on_connect_failed(msg or "Connection closed during authorization.")
+        elif time.monotonic() >= self._connect_deadline:
+            _, msg = t.get_connection_status()
+            self._on_connect_failed(msg or "Timed out waiting for account authorization.")
+        else:
+            self.after(self.CONNECT_POLL_MS, self._poll_connection)
 
-    # TODO Rename this here and in `attempt_connection`
-    def _extracted_from_attempt_connection_14(self, t):
-        t.start_heartbeat()
+    def _on_connect_failed(self, msg):
+        self.connect_button.config(state="normal")
+        messagebox.showerror("Connection Failed", msg)
+        self.status.config(text=f"Failed: {msg}", foreground="red")
+
+    def _on_connected(self, t):
+        self.connect_button.config(state="normal")
         summary = t.get_account_summary()
+        balance, equity, margin = (_fmt_amount(summary[k]) for k in ("balance", "equity", "margin"))
         self.account_id_var.set(summary.get("account_id", "–"))
-        self.balance_var.set(f"{summary['balance']:.2f}")
-        self.equity_var.set(f"{summary['equity']:.2f}")
-        self.margin_var.set(f"{summary['margin']:.2f}")
+        self.balance_var.set(balance)
+        self.equity_var.set(equity)
+        self.margin_var.set(margin)
         messagebox.showinfo(
             "Connected",
             f"Successfully connected!\n\n"
             f"Account ID: {summary['account_id']}\n"
-            f"Balance: {summary['balance']:.2f}\n"
-            f"Equity: {summary['equity']:.2f}\n"
-            f"Margin: {summary['margin']:.2f}"
+            f"Balance: {balance}\n"
+            f"Equity: {equity}\n"
+            f"Margin: {margin}"
         )
         self.status.config(text="Connected ✅", foreground="green")
         self.controller.show_page(TradingPage)
@@ -148,13 +188,38 @@ class SettingsPage(ttk.Frame):
 
 class TradingPage(ttk.Frame):
     COMMON_PAIRS = ["EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF", "AUD/USD", "NZD/USD"]
+    # (label, attribute, default) for the order parameter entries, rows 3-5
+    ORDER_FIELDS = (
+        ("Profit Target (pips):", "tp_var", 10.0),
+        ("Order Size (lots):", "size_var", 1.0),
+        ("Stop Loss (pips):", "sl_var", 5.0),
+    )
+    # (label, attribute, initial text) for the Session Stats frame
+    STATS_FIELDS = (
+        ("P&L:", "pnl_var", "0.00"),
+        ("# Trades:", "trades_var", "0"),
+        ("Win Rate:", "win_rate_var", "0%"),
+    )
+    SCALP_INTERVAL_S = 1.0
+    # Strategy display name -> class name in strategies.py (imported on first use)
+    STRATEGIES = {
+        "Safe": "SafeStrategy",
+        "Moderate": "ModerateStrategy",
+        "Aggressive": "AggressiveStrategy",
+        "Momentum": "MomentumStrategy",
+        "Mean Reversion": "MeanReversionStrategy",
+    }
+    LOG_FLUSH_MS = 50  # ~20 Hz: log lines and stats are written to the widgets at most this often
+    LOG_BUFFER_SIZE = 1000
 
     def __init__(self, parent, controller):
         super().__init__(parent, padding=10)
         self.controller = controller
         self.trader = controller.trader
         self.is_scalping = False
-        self.scalping_thread = None
+        self._strategy_cache = {}
+        self._looping = None  # LoopingCall driving _scalp_tick (Twisted path)
+        self._scalp_after_id = None  # pending Tk `after` id (fallback path)
 
         # configure grid
         for r in range(11):
@@ -184,25 +249,24 @@ class TradingPage(ttk.Frame):
                   font=("TkDefaultFont", 12, "bold")).pack(side="left")
         ttk.Button(pf, text="↻", width=2, command=self.refresh_price).pack(side="right")
 
-        # Profit target
-        ttk.Label(self, text="Profit Target (pips):").grid(row=3, column=0, sticky="w", padx=(0,5))
-        self.tp_var = tk.DoubleVar(value=10.0)
-        ttk.Entry(self, textvariable=self.tp_var).grid(row=3, column=1, sticky="ew")
-
-        # Order size
-        ttk.Label(self, text="Order Size (lots):").grid(row=4, column=0, sticky="w", padx=(0,5))
-        self.size_var = tk.DoubleVar(value=1.0)
-        ttk.Entry(self, textvariable=self.size_var).grid(row=4, column=1, sticky="ew")
+        # Profit target / order size / stop-loss
+        for row, (text, attr, default) in enumerate(self.ORDER_FIELDS, start=3):
+            var = tk.DoubleVar(value=default)
+            setattr(self, attr, var)
+            ttk.Label(self, text=text).grid(row=row, column=0, sticky="w", padx=(0,5))
+            ttk.Entry(self, textvariable=var).grid(row=row, column=1, sticky="ew")
 
-        # Stop-loss
-        ttk.Label(self, text="Stop Loss (pips):").grid(row=5, column=0, sticky="w", padx=(0,5))
-        self.sl_var = tk.DoubleVar(value=5.0)
-        ttk.Entry(self, textvariable=self.sl_var).grid(row=5, column=1, sticky="ew")
+        # Cache the form values read on every tick/order; the traces keep them in sync
+        self._symbol = self.COMMON_PAIRS[0].replace("/", "")
+        self.symbol_var.trace_add("write", self._on_symbol_change)
+        for var, attr in ((self.tp_var, "_tp"), (self.size_var, "_size"), (self.sl_var, "_sl")):
+            setattr(self, attr, var.get())
+            var.trace_add("write", lambda *_, v=var, a=attr: self._cache_var(v, a))
 
         # Strategy selector
         ttk.Label(self, text="Strategy:").grid(row=6, column=0, sticky="w", padx=(0,5))
         self.strategy_var = tk.StringVar(value="Safe")
-        strategy_names = ["Safe", "Moderate", "Aggressive", "Momentum", "Mean Reversion"]
+        strategy_names = list(self.STRATEGIES)
         cb_strat = ttk.Combobox(self, textvariable=self.strategy_var, values=strategy_names, state="readonly")
         cb_strat.grid(row=6, column=1, sticky="ew")
 
@@ -217,17 +281,11 @@ class TradingPage(ttk.Frame):
         stats.grid(row=9, column=0, columnspan=2, sticky="ew", pady=(10,0))
         stats.columnconfigure(1, weight=1)
 
-        self.pnl_var = tk.StringVar(value="0.00")
-        ttk.Label(stats, text="P&L:").grid(row=0, column=0, sticky="w", padx=(0,5))
-        ttk.Label(stats, textvariable=self.pnl_var).grid(row=0, column=1, sticky="w")
-
-        self.trades_var = tk.StringVar(value="0")
-        ttk.Label(stats, text="# Trades:").grid(row=1, column=0, sticky="w", padx=(0,5))
-        ttk.Label(stats, textvariable=self.trades_var).grid(row=1, column=1, sticky="w")
-
-        self.win_rate_var = tk.StringVar(value="0%")
-        ttk.Label(stats, text="Win Rate:").grid(row=2, column=0, sticky="w", padx=(0,5))
-        ttk.Label(stats, textvariable=self.win_rate_var).grid(row=2, column=1, sticky="w")
+        for row, (text, attr, initial) in enumerate(self.STATS_FIELDS):
+            var = tk.StringVar(value=initial)
+            setattr(self, attr, var)
+            ttk.Label(stats, text=text).grid(row=row, column=0, sticky="w", padx=(0,5))
+            ttk.Label(stats, textvariable=var).grid(row=row, column=1, sticky="w")
 
         # Output log
         self.output = tk.Text(self, height=8, wrap="word", state="disabled")
@@ -236,17 +294,49 @@ class TradingPage(ttk.Frame):
         sb.grid(row=11, column=2, sticky="ns")
         self.output.config(yscrollcommand=sb.set)
 
-        # Internal counters
-        self.total_pnl = 0.0
-        self.total_trades = 0
-        self.wins = 0
-
-        self.refresh_price()
+        # Session stats, one column per field and one row per symbol in COMMON_PAIRS.
+        # These are the source of truth; the stats StringVars are derived in _flush_ui.
+        self._sym_idx = {s.replace("/", ""): i for i, s in enumerate(self.COMMON_PAIRS)}
+        self._stat_pnl = [0.0] * len(self.COMMON_PAIRS)
+        self._stat_trades = [0] * len(self.COMMON_PAIRS)
+        self._stat_wins = [0] * len(self.COMMON_PAIRS)
+
+        # Pending log lines / stats, written to the widgets by _flush_ui
+        self._log_buf = collections.deque(maxlen=self.LOG_BUFFER_SIZE)
+        self._stats_dirty = False
+        self._flush_pending = False
+        # Last text written to each stats StringVar, so unchanged values skip the Tcl set
+        self._last_pnl_str = self.pnl_var.get()
+        self._last_trades_str = self.trades_var.get()
+        self._last_wr_str = self.win_rate_var.get()
+
+        self._price_loaded = False  # first price is fetched when the page is first shown
+
+    def on_show(self):
+        if not self._price_loaded:
+            self._price_loaded = True
+            self.refresh_price()
+
+    def _on_symbol_change(self, *_):
+        self._symbol = self.symbol_var.get().replace("/", "")
+        # Session stats are shown for the selected symbol
+        self._stats_dirty = True
+        self._schedule_flush()
+
+    def _cache_var(self, var, attr):
+        try:
+            setattr(self, attr, var.get())
+        except tk.TclError:
+            pass  # entry holds a partial/invalid number; keep the last valid value
 
     def refresh_price(self):
-        symbol = self.symbol_var.get().replace("/", "")
+        symbol = self._symbol
         try:
             price = self.trader.get_market_price(symbol)
+            if price is None:
+                self.price_var.set("–")
+                self._log(f"No price for {symbol} yet; waiting for the first quote.")
+                return
             self.price_var.set(f"{price:.5f}")
             self._log(f"Refreshed price for {symbol}: {price:.5f}")
         except Exception as e:
@@ -254,51 +344,56 @@ class TradingPage(ttk.Frame):
             self._log(f"Error fetching price: {e}")
 
     def place_order(self, side: str):
-        symbol = self.symbol_var.get().replace("/", "")
-        tp = self.tp_var.get()
-        sl = self.sl_var.get()
-        size = self.size_var.get()
+        symbol = self._symbol
+        tp = self._tp
+        sl = self._sl
+        size = self._size
         price = self.price_var.get()
         if price in ("–", "ERR"):
             self._log("Cannot place order: invalid price")
             return
         self._log(f"{side.upper()} scalp: {symbol} at {price} | size={size} lots | SL={sl} pips | TP={tp} pips")
         # TODO: insert FIX NewOrderSingle here and wait for execution
-        import random
-        result = round(random.uniform(-tp/2, tp), 2)
-        self.total_pnl += result
-        self.total_trades += 1
+        result = round(_ORDER_RNG.uniform(-tp/2, tp), 2)
+        idx = self._sym_idx[symbol]
+        self._stat_pnl[idx] += result
+        self._stat_trades[idx] += 1
         if result > 0:
-            self.wins += 1
-        self.pnl_var.set(f"{self.total_pnl:.2f}")
-        self.trades_var.set(str(self.total_trades))
-        win_rate = int((self.wins / self.total_trades) * 100) if self.total_trades > 0 else 0
-        self.win_rate_var.set(f"{win_rate}%")
-        self._log(f"Result: {result:+.2f} pips | Total P&L: {self.total_pnl:+.2f}")
+            self._stat_wins[idx] += 1
+        self._stats_dirty = True
+        self._schedule_flush()
+        self._log(f"Result: {result:+.2f} pips | Total P&L ({symbol}): {self._stat_pnl[idx]:+.2f}")
 
     def start_scalping(self):
         if self.is_scalping:
             return
-        # instantiate strategy
-        sel = self.strategy_var.get()
-        if sel == "Safe":
-            self.strategy = SafeStrategy()
-        elif sel == "Moderate":
-            self.strategy = ModerateStrategy()
-        elif sel == "Aggressive":
-            self.strategy = AggressiveStrategy()
-        elif sel == "Mean Reversion":
-            self.strategy = MeanReversionStrategy()
-        else:
-            self.strategy = MomentumStrategy()
+        self.strategy = self._get_strategy(self.strategy_var.get())
 
         self._extracted_from_stop_scalping_17(True, "disabled", "normal")
-        self.scalping_thread = threading.Thread(target=self._scalp_loop, daemon=True)
-        self.scalping_thread.start()
+        if _reactor_installed and reactor.running:
+            self._looping = LoopingCall(self._scalp_tick)
+            self._looping.start(self.SCALP_INTERVAL_S, now=False)
+        else:
+            self._schedule_scalp_tick()
+
+    def _get_strategy(self, name: str):
+        strategy = self._strategy_cache.get(name)
+        if strategy is None:
+            cls_name = self.STRATEGIES.get(name, "MomentumStrategy")
+            strategy = getattr(importlib.import_module("strategies"), cls_name)()
+            self._strategy_cache[name] = strategy
+        return strategy
 
     def stop_scalping(self):
         if self.is_scalping:
             self._extracted_from_stop_scalping_17(False, "normal", "disabled")
+            if self._looping is not None:
+                if self._looping.running:
+                    self._looping.stop()
+                self._looping = None
+            if self._scalp_after_id is not None:
+                self.after_cancel(self._scalp_after_id)
+                self._scalp_after_id = None
 
     # TODO Rename this here and in `start_scalping` and `stop_scalping`
     def _extracted_from_stop_scalping_17(self, arg0, state, arg2):
@@ -306,25 +401,76 @@ class TradingPage(ttk.Frame):
         self.start_button.config(state=state)
         self.stop_button.config(state=arg2)
 
-    def _scalp_loop(self):
-        while self.is_scalping:
-            # fetch price and update history
-            symbol = self.symbol_var.get().replace("/", "")
+    def _schedule_scalp_tick(self):
+        # Fallback when no reactor is running: re-arm a Tk timer after every tick.
+        self._scalp_after_id = self.after(int(self.SCALP_INTERVAL_S * 1000), self._scalp_after_tick)
+
+    def _scalp_after_tick(self):
+        self._scalp_after_id = None
+        self._scalp_tick()
+        if self.is_scalping:
+            self._schedule_scalp_tick()
+
+    def _scalp_tick(self):
+        # One iteration of the scalping loop; always runs on the Tk/reactor thread.
+        if not self.is_scalping:
+            return
+        symbol = self._symbol
+        try:
             price = self.trader.get_market_price(symbol)
-            history = self.trader.price_history
-            action = self.strategy.decide({"prices": history})
-            if action in ("buy", "sell"):
-                self.place_order(action)
-            else:
-                self._log("HOLD signal; skipping trade.")
-            time.sleep(1)
+        except Exception as e:
+            self._log(f"Error fetching price: {e}; stopping scalping.")
+            self.stop_scalping()
+            return
+        if price is None:
+            self._log(f"Waiting for the first {symbol} quote; skipping tick.")
+            return
+        self._on_price(price)
+
+    def _on_price(self, price: float):
+        history = self.trader.get_price_history()
+        action = self.strategy.decide({"prices": history})
+        if action in ("buy", "sell"):
+            self.place_order(action)
+        else:
+            self._log("HOLD signal; skipping trade.")
 
     def _log(self, msg: str):
-        ts = time.strftime("%H:%M:%S")
-        self.output.configure(state="normal")
-        self.output.insert("end", f"[{ts}] {msg}\n")
-        self.output.see("end")
-        self.output.configure(state="disabled")
+        self._log_buf.append((time.strftime("%H:%M:%S"), msg))
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.after(self.LOG_FLUSH_MS, self._flush_ui)
+
+    def _flush_ui(self):
+        # Apply everything queued since the last flush in one pass over the widgets.
+        self._flush_pending = False
+        if self._stats_dirty:
+            self._stats_dirty = False
+            idx = self._sym_idx[self._symbol]
+            trades = self._stat_trades[idx]
+            pnl_str = f"{self._stat_pnl[idx]:.2f}"
+            if pnl_str != self._last_pnl_str:
+                self.pnl_var.set(pnl_str)
+                self._last_pnl_str = pnl_str
+            trades_str = str(trades)
+            if trades_str != self._last_trades_str:
+                self.trades_var.set(trades_str)
+                self._last_trades_str = trades_str
+            win_rate = int((self._stat_wins[idx] / trades) * 100) if trades > 0 else 0
+            wr_str = f"{win_rate}%"
+            if wr_str != self._last_wr_str:
+                self.win_rate_var.set(wr_str)
+                self._last_wr_str = wr_str
+        if self._log_buf:
+            text = "".join(f"[{ts}] {msg}\n" for ts, msg in self._log_buf)
+            self._log_buf.clear()
+            self.output.configure(state="normal")
+            self.output.insert("end", text)
+            self.output.see("end")
+            self.output.configure(state="disabled")
 
 
 if __name__ == "__main__":
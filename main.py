@@ -27,8 +27,7 @@ def main() -> None:
         tksupport.install(app) # app is the tk.Tk instance
         # reactor.run() will process both Twisted events and Tkinter events.
         # It replaces app.mainloop().
-        # The Trader class should be aware if reactor is run this way
-        # to avoid starting its own reactor thread.
+        # Trader.connect() relies on this; it refuses to connect without a running reactor.
         print("Starting Twisted reactor (which now includes Tkinter event loop).")
         reactor.run()
     else:
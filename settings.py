@@ -1,13 +1,58 @@
 import json
 import os
+import functools
+import tempfile
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Optional
 
+try:
+    import orjson # Optional C-accelerated parser; stdlib json is used if it's missing
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+
+def _dumps(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+# Shared read-only stand-in for a missing config section, instead of a fresh {} per load
+_EMPTY_SECTION = MappingProxyType({})
+
+# Secrets from environment variables, read once at import
+ENV_CLIENT_ID: Optional[str] = os.environ.get("CTRADER_CLIENT_ID")
+ENV_CLIENT_SECRET: Optional[str] = os.environ.get("CTRADER_CLIENT_SECRET")
+ENV_ACCESS_TOKEN: Optional[str] = os.environ.get("CTRADER_ACCESS_TOKEN")
+
+
+def _refresh_env() -> None:
+    # Re-read the CTRADER_* variables, e.g. after they were changed in-process
+    global ENV_CLIENT_ID, ENV_CLIENT_SECRET, ENV_ACCESS_TOKEN
+    ENV_CLIENT_ID = os.environ.get("CTRADER_CLIENT_ID")
+    ENV_CLIENT_SECRET = os.environ.get("CTRADER_CLIENT_SECRET")
+    ENV_ACCESS_TOKEN = os.environ.get("CTRADER_ACCESS_TOKEN")
+
+
+@functools.lru_cache(maxsize=4)
+def _read_config(path: str, mtime_ns: int) -> dict:
+    # Keyed by mtime so an edited (or re-saved) config.json is parsed again.
+    # Callers must treat the returned dict as read-only since it is shared between loads.
+    with open(path, 'rb') as f:
+        data = f.read()
+    return _loads(data)
+
+
 @dataclass
 class OpenAPISettings:
     # Credentials - preferentially loaded from environment variables
     client_id: Optional[str] = None
     client_secret: Optional[str] = None
+    # OAuth access token for the trading account(s); required by ProtoOAAccountAuthReq
+    access_token: Optional[str] = None
 
     # Connection type: "demo" or "live". This will be used with OpenApiPy's EndPoints.
     host_type: str = "demo"
@@ -39,25 +84,26 @@ class Settings:
     @staticmethod
     def load(path: str = "config.json") -> "Settings":
         # Load secrets from environment variables first
-        env_client_id = os.environ.get("CTRADER_CLIENT_ID")
-        env_client_secret = os.environ.get("CTRADER_CLIENT_SECRET")
+        env_client_id = ENV_CLIENT_ID
+        env_client_secret = ENV_CLIENT_SECRET
 
         try:
-            with open(path, 'r') as f:
-                cfg_data = json.load(f)
+            abspath = os.path.abspath(path)
+            cfg_data = _read_config(abspath, os.stat(abspath).st_mtime_ns)
         except FileNotFoundError:
             print(f"Warning: Settings file '{path}' not found. Using default values and environment variables.")
-            cfg_data = {}
-        except json.JSONDecodeError:
+            cfg_data = _EMPTY_SECTION
+        except ValueError: # json/orjson JSONDecodeError, or undecodable bytes
             print(f"Warning: Error decoding JSON from '{path}'. Using default values and environment variables.")
-            cfg_data = {}
+            cfg_data = _EMPTY_SECTION
 
-        openapi_cfg = cfg_data.get("openapi", {})
-        general_cfg = cfg_data.get("general", {})
+        openapi_cfg = cfg_data.get("openapi") or _EMPTY_SECTION
+        general_cfg = cfg_data.get("general") or _EMPTY_SECTION
 
         # Prioritize env vars for secrets, then config file, then None
         client_id = env_client_id if env_client_id else openapi_cfg.get("client_id")
         client_secret = env_client_secret if env_client_secret else openapi_cfg.get("client_secret")
+        access_token = ENV_ACCESS_TOKEN if ENV_ACCESS_TOKEN else openapi_cfg.get("access_token")
 
         if not client_id:
             print("Warning: cTrader Client ID not found in environment variables (CTRADER_CLIENT_ID) or config.json.")
@@ -67,6 +113,7 @@ class Settings:
         openapi_settings = OpenAPISettings(
             client_id=client_id,
             client_secret=client_secret,
+            access_token=access_token,
             host_type=openapi_cfg.get("host_type", "demo").lower(), # Ensure lowercase "demo" or "live"
             default_ctid_trader_account_id=openapi_cfg.get("default_ctid_trader_account_id"),
             # Load potentially obsolete URLs, they will be None if not in config and no default given here
@@ -82,21 +129,31 @@ class Settings:
         return Settings(openapi=openapi_settings, general=general_settings)
 
     def save(self, path: str = "config.json") -> None:
-        # Create a representation of settings that is safe to save (e.g., without tokens)
-        # Only save configurable parts, not runtime state like access tokens.
-        openapi_data_to_save = {
-            "client_id": self.openapi.client_id if not os.environ.get("CTRADER_CLIENT_ID") else None,
-            "client_secret": self.openapi.client_secret if not os.environ.get("CTRADER_CLIENT_SECRET") else None,
-            "host_type": self.openapi.host_type,
-            "default_ctid_trader_account_id": self.openapi.default_ctid_trader_account_id,
-            "auth_url": self.openapi.auth_url, # Save if present, might be obsolete
-            "token_url": self.openapi.token_url, # Save if present, might be obsolete
-        }
-        # Filter out None values to keep config clean, especially for secrets from env
-        openapi_data_to_save = {k: v for k, v in openapi_data_to_save.items() if v is not None}
-
-        if openapi_data_to_save.get("client_id") or openapi_data_to_save.get("client_secret"):
-            print(f"Warning: Saving Client ID or Client Secret to '{path}'. "
+        # Only save configurable parts, not runtime state.
+        # Keys are only added when they have a value, keeping the config clean; secrets that
+        # come from the environment are never written back
+        openapi = self.openapi
+        openapi_data_to_save = {}
+        saving_secrets = False
+        if not ENV_CLIENT_ID and openapi.client_id is not None:
+            openapi_data_to_save["client_id"] = openapi.client_id
+            saving_secrets = saving_secrets or bool(openapi.client_id)
+        if not ENV_CLIENT_SECRET and openapi.client_secret is not None:
+            openapi_data_to_save["client_secret"] = openapi.client_secret
+            saving_secrets = saving_secrets or bool(openapi.client_secret)
+        if not ENV_ACCESS_TOKEN and openapi.access_token is not None:
+            openapi_data_to_save["access_token"] = openapi.access_token
+            saving_secrets = saving_secrets or bool(openapi.access_token)
+        openapi_data_to_save["host_type"] = openapi.host_type
+        if openapi.default_ctid_trader_account_id is not None:
+            openapi_data_to_save["default_ctid_trader_account_id"] = openapi.default_ctid_trader_account_id
+        if openapi.auth_url is not None: # Save if present, might be obsolete
+            openapi_data_to_save["auth_url"] = openapi.auth_url
+        if openapi.token_url is not None: # Save if present, might be obsolete
+            openapi_data_to_save["token_url"] = openapi.token_url
+
+        if saving_secrets:
+            print(f"Warning: Saving Client ID, Client Secret or access token to '{path}'. "
                   "It's generally recommended to use environment variables for these secrets.")
 
         data_to_save = {
@@ -106,5 +163,16 @@ class Settings:
                 "chart_update_interval_ms": self.general.chart_update_interval_ms,
             }
         }
-        with open(path, 'w') as f:
-            json.dump(data_to_save, f, indent=4)
+        # Write a temp file next to the target and swap it in, so a crash mid-write
+        # can't leave a truncated config.json behind
+        buf = _dumps(data_to_save)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(buf)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # A rewrite within the filesystem's mtime granularity would otherwise hit the stale entry
+        _read_config.cache_clear()
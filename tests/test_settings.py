@@ -0,0 +1,94 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings
+from settings import GeneralSettings, OpenAPISettings, Settings
+
+_ENV_KEYS = ("CTRADER_CLIENT_ID", "CTRADER_CLIENT_SECRET", "CTRADER_ACCESS_TOKEN")
+
+
+class SettingsTestCase(unittest.TestCase):
+    """Runs against a config.json in a temp dir, with the CTRADER_* variables unset unless a test sets them."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "config.json")
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        for key in _ENV_KEYS:
+            os.environ.pop(key, None)
+        settings._refresh_env()
+        self.addCleanup(settings._refresh_env) # Runs after env.stop, restoring the real values
+
+    def set_env(self, key, value):
+        os.environ[key] = value
+        settings._refresh_env()
+
+    def load(self) -> Settings:
+        with contextlib.redirect_stdout(io.StringIO()): # Missing-secret warnings
+            return Settings.load(self.path)
+
+    def save(self, cfg: Settings) -> None:
+        with contextlib.redirect_stdout(io.StringIO()): # Saving-secrets warning
+            cfg.save(self.path)
+
+
+class AccessTokenTest(SettingsTestCase):
+    def test_round_trips_through_config(self):
+        self.save(Settings(openapi=OpenAPISettings(access_token="tok-123"), general=GeneralSettings()))
+        self.assertEqual(self.load().openapi.access_token, "tok-123")
+
+    def test_environment_wins_and_is_not_saved(self):
+        self.save(Settings(openapi=OpenAPISettings(access_token="from-file"), general=GeneralSettings()))
+        self.set_env("CTRADER_ACCESS_TOKEN", "from-env")
+        cfg = self.load()
+        self.assertEqual(cfg.openapi.access_token, "from-env")
+
+        self.save(cfg)
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        self.assertNotIn("access_token", settings._loads(raw)["openapi"])
+        self.assertNotIn(b"from-env", raw)
+
+
+class AtomicSaveTest(SettingsTestCase):
+    def _settings(self, host_type="demo") -> Settings:
+        return Settings(
+            openapi=OpenAPISettings(client_id="id", client_secret="secret", host_type=host_type,
+                                    default_ctid_trader_account_id=12345),
+            general=GeneralSettings(default_symbol="USDJPY", chart_update_interval_ms=250),
+        )
+
+    def test_save_then_load_round_trips(self):
+        cfg = self._settings()
+        self.save(cfg)
+        self.assertEqual(self.load(), cfg)
+        self.assertEqual(os.listdir(self.dir), ["config.json"])
+
+    def test_failed_write_keeps_original(self):
+        self.save(self._settings())
+        with open(self.path, "rb") as f:
+            original = f.read()
+
+        with mock.patch("settings.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.save(self._settings(host_type="live"))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), original)
+        self.assertEqual(os.listdir(self.dir), ["config.json"]) # No .tmp left behind
+        self.assertEqual(self.load().openapi.host_type, "demo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trading
+
+HAVE_OPENAPI = trading._ensure_openapi()
+if HAVE_OPENAPI:
+    from ctrader_open_api.messages.OpenApiModelMessages_pb2 import ProtoOATrendbarPeriod
+
+
+def _decoded(data: bytes):
+    # What the protobuf path hands to _apply_spot for the same bytes
+    event = trading.ProtoOASpotEvent()
+    event.ParseFromString(data)
+    return event.symbolId, event.bid or None, event.ask or None
+
+
+@unittest.skipUnless(HAVE_OPENAPI, "ctrader-open-api not installed")
+class ScanSpotFieldsTest(unittest.TestCase):
+    """_scan_spot_fields must agree with ProtoOASpotEvent.ParseFromString or return None."""
+
+    def test_matches_protobuf_on_random_ticks(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            event = trading.ProtoOASpotEvent(
+                ctidTraderAccountId=rng.randrange(1, 1 << 40),
+                symbolId=rng.randrange(1, 1 << 20),
+            )
+            # Sides are optional and may be explicitly 0; values span 1- to 9-byte varints
+            if rng.random() < 0.8:
+                event.bid = rng.choice((0, rng.randrange(1, 1 << 7), rng.randrange(1 << 14, 1 << 63)))
+            if rng.random() < 0.8:
+                event.ask = rng.choice((0, rng.randrange(1, 1 << 7), rng.randrange(1 << 14, 1 << 63)))
+            if rng.random() < 0.5:
+                event.sessionClose = rng.randrange(0, 1 << 40)
+            if rng.random() < 0.5:
+                event.timestamp = rng.randrange(0, 1 << 45)
+            data = event.SerializeToString()
+            self.assertEqual(trading._scan_spot_fields(data), _decoded(data))
+
+    def test_zero_sides_read_as_absent(self):
+        data = trading.ProtoOASpotEvent(ctidTraderAccountId=1, symbolId=2, bid=0, ask=110005).SerializeToString()
+        self.assertEqual(trading._scan_spot_fields(data), (2, None, 110005))
+
+    def test_trendbar_falls_back(self):
+        event = trading.ProtoOASpotEvent(ctidTraderAccountId=1, symbolId=2, bid=110000, ask=110010)
+        bar = event.trendbar.add()
+        bar.volume = 10
+        bar.period = ProtoOATrendbarPeriod.M1
+        self.assertIsNone(trading._scan_spot_fields(event.SerializeToString()))
+
+    def test_truncated_buffer_falls_back(self):
+        data = trading.ProtoOASpotEvent(
+            ctidTraderAccountId=1, symbolId=2, bid=110000, ask=110010, timestamp=1 << 40,
+        ).SerializeToString()
+        # Cut inside the multi-byte timestamp varint and right after a key
+        self.assertIsNone(trading._scan_spot_fields(data[:-1]))
+        self.assertIsNone(trading._scan_spot_fields(data[:-6]))
+
+    def test_multi_byte_key_falls_back(self):
+        data = trading.ProtoOASpotEvent(ctidTraderAccountId=1, symbolId=2, bid=110000).SerializeToString()
+        # Field 16 as a varint needs a two-byte key (0x80 0x01)
+        self.assertIsNone(trading._scan_spot_fields(data + b"\x80\x01\x05"))
+
+    def test_multi_byte_varints_decode(self):
+        event = trading.ProtoOASpotEvent(ctidTraderAccountId=(1 << 35) + 7, symbolId=300, bid=(1 << 62) + 1, ask=128)
+        data = event.SerializeToString()
+        self.assertEqual(trading._scan_spot_fields(data), (300, (1 << 62) + 1, 128))
+
+    def test_missing_symbol_id_falls_back(self):
+        self.assertIsNone(trading._scan_spot_fields(b"\x10\x01\x20\x05"))
+        self.assertIsNone(trading._scan_spot_fields(b""))
+
+
+if __name__ == "__main__":
+    unittest.main()
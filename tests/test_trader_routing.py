@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trading
+from settings import GeneralSettings, OpenAPISettings, Settings
+
+HAVE_OPENAPI = trading._ensure_openapi()
+if HAVE_OPENAPI:
+    from ctrader_open_api.messages.OpenApiCommonMessages_pb2 import ProtoMessage
+    from twisted.internet.defer import Deferred
+    from twisted.python.failure import Failure
+
+
+def _envelope(message):
+    # What a client.send() Deferred fires with for a reply
+    return ProtoMessage(payloadType=message.payloadType, payload=message.SerializeToString())
+
+
+@unittest.skipUnless(HAVE_OPENAPI, "ctrader-open-api not installed")
+class ResponseRoutingTest(unittest.TestCase):
+    """Replies to Deferred-routed requests reach their handler decoded; failures respect the connection."""
+
+    def setUp(self):
+        self.trader = trading.Trader(Settings(openapi=OpenAPISettings(), general=GeneralSettings()))
+        self.received = []
+
+    def test_handler_gets_decoded_message(self):
+        reply = trading.ProtoOAAccountAuthRes(ctidTraderAccountId=42)
+        self.trader._on_response(_envelope(reply), self.received.append)
+        self.assertEqual(len(self.received), 1)
+        self.assertIsInstance(self.received[0], trading.ProtoOAAccountAuthRes)
+        self.assertEqual(self.received[0], reply)
+
+    def test_error_reply_is_skipped(self):
+        error = trading.ProtoOAErrorRes(errorCode="CH_ACCESS_TOKEN_INVALID", description="bad token")
+        self.trader._on_response(_envelope(error), self.received.append)
+        self.assertEqual(self.received, [])
+
+    def test_send_error_ends_current_logon(self):
+        self.trader._connection_gen = 3
+        self.trader.is_connected = True
+        self.trader._handle_send_error(Failure(TimeoutError("no reply")), 3)
+        self.assertFalse(self.trader.is_connected)
+        self.assertTrue(self.trader._logon_event.is_set())
+        self.assertIn("no reply", self.trader._last_error)
+
+    def test_send_error_from_previous_connection_is_ignored(self):
+        self.trader._connection_gen = 3
+        self.trader.is_connected = True
+        self.trader._handle_send_error(Failure(TimeoutError("no reply")), 2)
+        self.assertTrue(self.trader.is_connected)
+        self.assertFalse(self.trader._logon_event.is_set())
+        self.assertEqual(self.trader._last_error, "")
+
+    def test_subscription_error_allows_resubscribe(self):
+        self.trader._subscribed.update({1, 2, 3})
+        self.trader.is_connected = True
+        self.trader._handle_subscription_error(Failure(TimeoutError("no ack")), [1, 2], self.trader._connection_gen)
+        self.assertEqual(self.trader._subscribed, {3})
+        self.assertTrue(self.trader.is_connected)
+        self.assertFalse(self.trader._logon_event.is_set())
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message, **kwargs):
+        self.sent.append(message)
+        return Deferred()
+
+
+@unittest.skipUnless(HAVE_OPENAPI, "ctrader-open-api not installed")
+class ConnectRetryTest(unittest.TestCase):
+    """connect() restarts a failed auth chain when the TCP connection is still up."""
+
+    def test_failed_logon_on_open_connection_is_retried(self):
+        trader = trading.Trader(Settings(openapi=OpenAPISettings(client_id="id", client_secret="secret"),
+                                         general=GeneralSettings()))
+        trader._client = _RecordingClient()
+        trader._is_client_connected = True
+        trader._connection_gen = 1
+        trader._last_error = "API Error: CH_ACCESS_TOKEN_INVALID - bad token"
+        trader._logon_event.set()
+
+        self.assertTrue(trader.connect())
+        self.assertFalse(trader._logon_event.is_set())
+        self.assertEqual(trader._last_error, "")
+        self.assertEqual(trader._connection_gen, 2)
+        self.assertEqual([type(m) for m in trader._client.sent], [trading.ProtoOAApplicationAuthReq])
+
+
+if __name__ == "__main__":
+    unittest.main()
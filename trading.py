@@ -1,9 +1,38 @@
+from __future__ import annotations # Annotations name OpenApiPy classes that are only imported on connect()
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 import threading
 import random # Keep for mock data if needed
-import time
+from collections import deque
 # import os # No longer directly used
 # import json # No longer directly used for main communication (Protobuf is used)
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    # A full queue drops the record rather than blocking the reactor thread or raising
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+# Records are formatted on the calling thread (so reused protobuf buffers are rendered before they
+# change) and only queued; a QueueListener thread does the actual console writes. Messages below
+# INFO, like the per-message RECV dumps, are skipped before any formatting happens.
+log = logging.getLogger("trading")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue: queue.Queue = queue.Queue(maxsize=10000)
+log.addHandler(_DroppingQueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 # Conditional import for Twisted reactor for GUI integration.
 _reactor_installed = False
@@ -11,46 +40,156 @@ try:
     from twisted.internet import reactor, tksupport # Or qtreactor for Qt, wpreactor for Wx etc.
     _reactor_installed = True
 except ImportError:
-    print("Twisted reactor or GUI support (tksupport) not found. GUI integration with Twisted might require manual setup.")
+    log.warning("Twisted reactor or GUI support (tksupport) not found. GUI integration with Twisted might require manual setup.")
     # reactor will be None or undefined, calls to reactor.callFromThread will fail
 
-# Imports from spotware/OpenApiPy
-try:
-    from ctrader_open_api import Client, Protobuf, TcpProtocol, EndPoints
-    from ctrader_open_api.messages.OpenApiCommonMessages_pb2 import (
-        ProtoOAPayloadType, ProtoOAErrorCode, ProtoHeartbeatEvent,
-        ProtoOATraderUpdatedEvent, ProtoOASpotEvent, ProtoOAExecutionEvent, # Assuming these are common enough
-        ProtoOATradeSide # Enum for order placement
-        # Add other common enums if needed, e.g. ProtoOAOrderType
-    )
-    from ctrader_open_api.messages.OpenApiMessages_pb2 import (
-        ProtoOAApplicationAuthReq, ProtoOAApplicationAuthRes,
-        ProtoOAAccountAuthReq, ProtoOAAccountAuthRes,
-        ProtoOAGetAccountListReq, ProtoOAGetAccountListRes,
-        ProtoOAGetTraderReq, ProtoOATraderRes,
-        ProtoOASubscribeSpotsReq, ProtoOASubscribeSpotsRes, # Assuming response exists
-        ProtoOANewOrderReq, # Assuming response is ProtoOAExecutionEvent
-        ProtoPingReq, ProtoPingRes,
-        ProtoOAErrorRes
-    )
-    from ctrader_open_api.messages.OpenApiModelMessages_pb2 import (
-        ProtoOATrader # Model used in ProtoOATraderRes
-        # Add other models if directly used, e.g. ProtoOAOrder, ProtoOAPosition
-    )
-    USE_OPENAPI_LIB = True
-except ImportError:
-    print("ctrader-open-api library not found. Please install it. Running in mock mode.")
-    USE_OPENAPI_LIB = False
+# spotware/OpenApiPy is imported by _ensure_openapi() on the first Trader.connect(), so starting the
+# GUI (or running in mock mode) doesn't load its client stack and protobuf message modules.
+# None = not tried yet, True = available, False = not installed (mock mode).
+USE_OPENAPI_LIB: Optional[bool] = None
+
+
+def _ensure_openapi() -> bool:
+    global USE_OPENAPI_LIB, Client, Protobuf, TcpProtocol, EndPoints, ProtoHeartbeatEvent
+    global ProtoOAApplicationAuthReq, ProtoOAApplicationAuthRes, ProtoOAAccountAuthReq, ProtoOAAccountAuthRes
+    global ProtoOAGetAccountListByAccessTokenReq, ProtoOAGetAccountListByAccessTokenRes
+    global ProtoOATraderReq, ProtoOATraderRes, ProtoOATraderUpdatedEvent, ProtoOASpotEvent, ProtoOAExecutionEvent
+    global ProtoOASubscribeSpotsReq, ProtoOAUnsubscribeSpotsReq, ProtoOASymbolsListReq, ProtoOASymbolsListRes
+    global ProtoOANewOrderReq, ProtoOAErrorRes
+    global ProtoOATradeSide, ProtoOAOrderType, _DECODE_BUFFERS, _SPOT_EVENT_TYPE, _ERROR_RES_TYPE
+    if USE_OPENAPI_LIB is not None:
+        return USE_OPENAPI_LIB
+    try:
+        from ctrader_open_api import Client, Protobuf, TcpProtocol, EndPoints
+        from ctrader_open_api.messages.OpenApiCommonMessages_pb2 import ProtoHeartbeatEvent
+        from ctrader_open_api.messages.OpenApiMessages_pb2 import (
+            ProtoOAApplicationAuthReq, ProtoOAApplicationAuthRes,
+            ProtoOAAccountAuthReq, ProtoOAAccountAuthRes,
+            ProtoOAGetAccountListByAccessTokenReq, ProtoOAGetAccountListByAccessTokenRes,
+            ProtoOATraderReq, ProtoOATraderRes,
+            ProtoOATraderUpdatedEvent, ProtoOASpotEvent, ProtoOAExecutionEvent,
+            ProtoOASubscribeSpotsReq, ProtoOAUnsubscribeSpotsReq,
+            ProtoOASymbolsListReq, ProtoOASymbolsListRes,
+            ProtoOANewOrderReq, # Response is ProtoOAExecutionEvent
+            ProtoOAErrorRes
+        )
+        from ctrader_open_api.messages.OpenApiModelMessages_pb2 import (
+            ProtoOATradeSide, ProtoOAOrderType # Enums for order placement
+            # Add other models if directly used, e.g. ProtoOAOrder, ProtoOAPosition
+        )
+    except ImportError:
+        log.warning("ctrader-open-api library not found. Please install it. Running in mock mode.")
+        USE_OPENAPI_LIB = False
+    else:
+        USE_OPENAPI_LIB = True
+        # One reusable instance per high-rate payload type; ParseFromString clears it before decoding
+        _DECODE_BUFFERS = {msg.payloadType: msg for msg in (ProtoOASpotEvent(), ProtoHeartbeatEvent())}
+        _SPOT_EVENT_TYPE = ProtoOASpotEvent().payloadType
+        _ERROR_RES_TYPE = ProtoOAErrorRes().payloadType
+    return USE_OPENAPI_LIB
+
+
+# payloadType -> preallocated message that incoming payloads of that type are decoded into.
+# Only valid until the next message of the same type, so handlers must not keep a reference.
+_DECODE_BUFFERS: Dict[int, Any] = {}
+
+# Spot events are read straight from the payload bytes by _scan_spot_fields instead of being
+# decoded into a message object. Set to False to always go through protobuf.
+BYPASS_SPOT_PARSING = True
+_SPOT_EVENT_TYPE: Optional[int] = None
+_ERROR_RES_TYPE: Optional[int] = None
+
+# Deadline for responses routed through send() Deferreds. OpenApiPy's default of 5 s starts before the
+# request has left its 5-per-second send queue, and a large ProtoOASymbolsListRes can take longer;
+# once it expires the Deferred is dropped (and a still-queued request is never sent).
+RESPONSE_TIMEOUT_S = 30
+
+
+def _scan_spot_fields(data: bytes):
+    """Return (symbolId, bid, ask) from a serialized ProtoOASpotEvent, or None.
+
+    bid/ask are None when absent or 0, as in _handle_spot_event. Every field of a plain
+    quote tick (payloadType, ctidTraderAccountId, symbolId, bid, ask, sessionClose,
+    timestamp) is a varint, so the payload is just key/varint pairs. Anything else - trendbars, unknown fields, a
+    truncated buffer - returns None and the caller falls back to protobuf.
+    """
+    symbol_id = bid = ask = None
+    i = 0
+    n = len(data)
+    try:
+        while i < n:
+            key = data[i]
+            i += 1
+            if key & 0x87: # Not a single-byte key (field < 16) with wire type 0 (varint)
+                return None
+            value = 0
+            shift = 0
+            while True:
+                b = data[i]
+                i += 1
+                value |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+            field = key >> 3
+            if field == 3:
+                symbol_id = value
+            elif field == 4:
+                bid = value
+            elif field == 5:
+                ask = value
+    except IndexError:
+        return None
+    if symbol_id is None:
+        return None
+    return symbol_id, bid or None, ask or None
+
+# ProtoOASpotEvent bid/ask are integers in 1/100000 of a price unit
+SPOT_PRICE_SCALE = 100000.0
+# ProtoOATrader.balance is in cents
+_CENT = 0.01
+# Example depositAssetId -> currency map; unknown ids are shown as the raw id
+_ASSET_CURRENCIES = {1: "USD", 2: "EUR", 3: "GBP"}
 
 
 class Trader:
+    # Fixed attribute set: slot access on the per-tick paths and no per-instance __dict__
+    __slots__ = (
+        "settings", "is_connected", "_is_client_connected", "_last_error",
+        "price_history", "history_size", "_history_snapshot", "_rng",
+        "_symbol_ids", "_subscribed", "_pending_subscriptions",
+        "_slot_by_id", "_slot_by_name", "_bids", "_asks", "_mids",
+        "_active_symbol", "_active_slot", "_price_event",
+        "ctid_trader_account_id", "account_id", "balance", "equity", "margin", "currency",
+        "_client", "_dispatch", "_message_id_counter", "_logon_event", "_connection_gen",
+    )
+
     def __init__(self, settings, history_size: int = 100):
         self.settings = settings # Instance of Settings class
         self.is_connected = False # Overall connection status (app auth + account auth if needed)
         self._is_client_connected = False # Underlying OpenApiPy client connection status
         self._last_error = ""
-        self.price_history: List[float] = [] # Simplified price history
+        # Simplified price history; the deque drops the oldest tick itself once history_size is reached
+        self.price_history: deque = deque(maxlen=history_size)
         self.history_size = history_size
+        self._history_snapshot: Optional[tuple] = None # Cached get_price_history() result, reset on change
+        self._rng = random.Random() # Mock prices; avoids sharing the module-level generator
+        # Symbol name (e.g. "EURUSD") -> cTrader symbolId, filled from ProtoOASymbolsListRes after account auth
+        self._symbol_ids: Dict[str, int] = {}
+        self._subscribed: set = set() # symbolIds with a spot subscription sent this session
+        self._pending_subscriptions: set = set() # Symbol names requested before the symbol list arrived
+        # Latest quotes in flat per-slot lists. A slot is assigned when a symbol is first subscribed,
+        # so a spot tick costs one symbolId -> slot probe and then plain list stores.
+        # Spot events only carry the side(s) that changed, hence bid and ask are kept separately.
+        self._slot_by_id: Dict[int, int] = {}
+        self._slot_by_name: Dict[str, int] = {}
+        self._bids: List[Optional[float]] = []
+        self._asks: List[Optional[float]] = []
+        self._mids: List[Optional[float]] = []
+        # price_history is a single series for the symbol most recently passed to get_market_price
+        self._active_symbol: Optional[str] = None
+        self._active_slot: Optional[int] = None
+        self._price_event = threading.Event() # Set once a spot price for the active symbol has arrived
 
         # Attributes for live account data (populated from Proto messages)
         self.ctid_trader_account_id: Optional[int] = self.settings.openapi.default_ctid_trader_account_id
@@ -61,22 +200,40 @@ class Trader:
         self.currency: Optional[str] = None
 
         self._client: Optional[Client] = None
+        self._dispatch: Dict[int, Any] = {} # payloadType -> handler, filled by _create_client
         self._message_id_counter: int = 1
-        self._reactor_thread: Optional[threading.Thread] = None # For running Twisted reactor
-
-        if USE_OPENAPI_LIB:
-            host = EndPoints.PROTOBUF_LIVE_HOST if self.settings.openapi.host_type == "live" else EndPoints.PROTOBUF_DEMO_HOST
-            port = EndPoints.PROTOBUF_PORT
-            self._client = Client(host, port, TcpProtocol)
-
-            # Set callbacks
-            self._client.setConnectedCallback(self._on_client_connected)
-            self._client.setDisconnectedCallback(self._on_client_disconnected)
-            self._client.setMessageReceivedCallback(self._on_message_received)
-            # Error callback can be added if library provides one for send errors not tied to Deferreds
-        else: # Mock mode if library not found
-            print("Trader initialized in MOCK mode due to missing ctrader-open-api library.")
-
+        # Set when the current connection attempt has finished: account details received (success)
+        # or any failure along the auth chain. Check is_connected afterwards for the outcome.
+        self._logon_event = threading.Event()
+        # Bumped whenever an auth chain starts. Send errbacks carry the value from send time, so a
+        # timeout left over from an earlier connection can't mark the current session as failed.
+        self._connection_gen = 0
+
+        if USE_OPENAPI_LIB is False: # Only known once a connect() has tried the import
+            log.warning("Trader initialized in MOCK mode due to missing ctrader-open-api library.")
+
+    def _create_client(self) -> Client:
+        host = EndPoints.PROTOBUF_LIVE_HOST if self.settings.openapi.host_type == "live" else EndPoints.PROTOBUF_DEMO_HOST
+        port = EndPoints.PROTOBUF_PORT
+        client = Client(host, port, TcpProtocol)
+
+        # Set callbacks
+        client.setConnectedCallback(self._on_client_connected)
+        client.setDisconnectedCallback(self._on_client_disconnected)
+        client.setMessageReceivedCallback(self._on_message_received)
+        # Error callback can be added if library provides one for send errors not tied to Deferreds
+
+        # payloadType -> handler for _on_message_received; built here since the message classes
+        # only exist once the library has been imported. Responses to our own requests are not
+        # listed: they go to the callback attached to the request's Deferred (see _on_response).
+        self._dispatch = {
+            ProtoOATraderUpdatedEvent().payloadType: self._handle_trader_updated_event, # Account balance/equity updates
+            ProtoOASpotEvent().payloadType: self._handle_spot_event,
+            ProtoOAExecutionEvent().payloadType: self._handle_execution_event,
+            ProtoHeartbeatEvent().payloadType: self._handle_heartbeat_event,
+            ProtoOAErrorRes().payloadType: self._handle_error_response,
+        }
+        return client
 
     def _next_message_id(self) -> str:
         # For clientMsgId field in Proto messages if library doesn't auto-generate
@@ -86,8 +243,9 @@ class Trader:
 
     # --- Callbacks for OpenApiPy Client ---
     def _on_client_connected(self, client: Client):
-        print("OpenApiPy Client Connected to server.")
+        log.info("OpenApiPy Client Connected to server.")
         self._is_client_connected = True
+        self._connection_gen += 1
         self._last_error = ""
 
         # Send ProtoOAApplicationAuthReq
@@ -97,66 +255,56 @@ class Trader:
 
         if not auth_req.clientId or not auth_req.clientSecret:
             self._last_error = "Client ID or Secret not configured for ProtoOAApplicationAuthReq. Cannot send Auth Req."
-            print(self._last_error)
+            log.error(self._last_error)
             # Disconnect the client as we can't proceed with app authentication.
             # This will trigger _on_client_disconnected.
             if self._client:
                 self._client.stopService() # Or a more direct disconnect if available and appropriate
             return
 
-        print(f"Sending ProtoOAApplicationAuthReq (clientId: {auth_req.clientId[:5]}...)")
-        deferred = client.send(auth_req)
-        deferred.addCallbacks(self._handle_app_auth_response, self._handle_send_error)
+        log.info("Sending ProtoOAApplicationAuthReq (clientId: %s...)", auth_req.clientId[:5])
+        deferred = client.send(auth_req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addCallbacks(self._on_response, self._handle_send_error,
+                              callbackArgs=(self._handle_app_auth_response,), errbackArgs=(self._connection_gen,))
 
     def _on_client_disconnected(self, client: Client, reason):
-        print(f"OpenApiPy Client Disconnected. Reason: {reason}")
+        log.info("OpenApiPy Client Disconnected. Reason: %s", reason)
         self.is_connected = False
         self._is_client_connected = False
+        self._subscribed.clear() # Spot subscriptions don't survive the connection
+        # Neither do the quotes they delivered; a stale price must not be served as live after reconnecting
+        for slot in range(len(self._mids)):
+            self._clear_quote(slot)
+        self._logon_event.set()
         # self._last_error = f"Disconnected: {reason}" # Optional: set last error
-        # Stop reactor if it was started by this class and no other components use it
-        if self._reactor_thread and _reactor_installed and reactor.running: # type: ignore
-            print("Attempting to stop Twisted reactor from disconnect callback.")
-            # reactor.stop() # Careful with stopping reactor if other parts of app use it.
 
     def _on_message_received(self, client: Client, message: Any):
-        # Extract common fields if possible (depends on how library wraps messages)
-        # The 'message' here is likely the raw protobuf message object
-        payload_type = getattr(message, "payloadType", None) # All Open API messages should have this
-        client_msg_id = getattr(message, "clientMsgId", None) if hasattr(message, "clientMsgId") else None
+        # 'message' is the ProtoMessage envelope; the actual message is serialized in its payload
+        payload_type = message.payloadType
+        if payload_type == _SPOT_EVENT_TYPE and BYPASS_SPOT_PARSING and not log.isEnabledFor(logging.DEBUG):
+            fields = _scan_spot_fields(message.payload)
+            if fields is not None:
+                self._apply_spot(*fields)
+                return
+        handler = self._dispatch.get(payload_type)
+        if handler is None and not log.isEnabledFor(logging.DEBUG):
+            return # e.g. a request's response, decoded by its Deferred callback instead
+        client_msg_id = message.clientMsgId
+        decoded = _DECODE_BUFFERS.get(payload_type)
+        if decoded is not None:
+            decoded.ParseFromString(message.payload) # Spot ticks reuse one instance instead of a new one each
+        else:
+            decoded = Protobuf.extract(message)
+        message = decoded
 
-        print(f"RECV (Type: {payload_type}, clientMsgId: {client_msg_id}): {Protobuf.extract(message)}")
+        log.debug("RECV (Type: %s, clientMsgId: %s): %s", payload_type, client_msg_id, message)
 
-        # Dispatch based on message type (payloadType or isinstance)
-        if isinstance(message, ProtoOAApplicationAuthRes):
-            # This is handled by the Deferred callback (_handle_app_auth_response)
-            # but good to log here if seen unexpectedly.
-            pass
-        elif isinstance(message, ProtoOAAccountAuthRes):
-            self._handle_account_auth_response(message)
-        elif isinstance(message, ProtoOAGetAccountListRes):
-             self._handle_get_account_list_response(message)
-        elif isinstance(message, ProtoOATraderRes): # Response to GetTraderReq
-            self._handle_trader_response(message)
-        elif isinstance(message, ProtoOATraderUpdatedEvent): # Account balance/equity updates
-            self._handle_trader_updated_event(message)
-        elif isinstance(message, ProtoOASpotEvent):
-            self._handle_spot_event(message)
-        elif isinstance(message, ProtoOAExecutionEvent):
-            self._handle_execution_event(message)
-        elif isinstance(message, ProtoHeartbeatEvent):
-            # Respond with ProtoPingReq if needed, or library might handle
-            print("Received ProtoHeartbeatEvent from server.")
-            # self._send_ping_request() # Example
-        elif isinstance(message, ProtoPingRes):
-            print(f"Received ProtoPingRes for clientMsgId {client_msg_id}.")
-        elif isinstance(message, ProtoOAErrorRes):
-            print(f"ERROR_RES: Code={message.errorCode}, Desc={message.description}, Maintenance={message.maintenanceCenterTimestamp}")
-            self._last_error = f"API Error: {message.errorCode} - {message.description}"
-        # Add more handlers...
+        if handler is not None:
+            handler(message)
 
     # --- Response and Error Handlers for Deferreds ---
     def _handle_app_auth_response(self, response: ProtoOAApplicationAuthRes):
-        print(f"Received ProtoOAApplicationAuthRes: {Protobuf.extract(response)}")
+        log.debug("Received ProtoOAApplicationAuthRes: %s", response)
         # After app auth, if ctidTraderAccountId is set, attempt account auth
         if self.ctid_trader_account_id:
             self._send_account_auth_request(self.ctid_trader_account_id)
@@ -165,251 +313,314 @@ class Trader:
             self._send_get_account_list_request()
         # self.is_connected = True # App auth is a step, full connection might depend on account auth
 
-    def _handle_send_error(self, failure):
+    def _on_response(self, envelope: Any, handler: Any):
+        # callback for client.send() Deferreds: they fire with the raw ProtoMessage envelope
+        if envelope.payloadType == _ERROR_RES_TYPE:
+            return # A ProtoOAErrorRes reply is already reported through _on_message_received
+        handler(Protobuf.extract(envelope))
+
+    def _handle_send_error(self, failure, generation: int):
         # errback for client.send() Deferreds
+        if generation != self._connection_gen:
+            # Client._disconnected drops pending Deferreds without cancelling their timeouts
+            log.debug("Ignoring failure from a previous connection: %s", failure.getErrorMessage())
+            return
         self._last_error = f"Failed to send message or process response: {failure.getErrorMessage()}"
-        print(self._last_error)
+        log.error(self._last_error)
         # failure.printTraceback() # For detailed debugging
         # Consider disconnecting or signaling error
         self.is_connected = False
+        self._logon_event.set()
         # if _reactor_installed and reactor.running: # type: ignore
         #     reactor.callFromThread(self.disconnect) # type: ignore
 
-    # --- Specific Message Handlers (called from _on_message_received) ---
+    def _handle_subscription_error(self, failure, symbol_ids: List[int], generation: int):
+        # errback for spot (un)subscribe Deferreds. A lost or late ack says nothing about the session,
+        # so the logon state is left alone; forgetting the ids lets the next price read subscribe again.
+        if generation != self._connection_gen:
+            return # _subscribed was already cleared on disconnect
+        log.warning("Spot subscription request for symbolIds %s failed: %s", symbol_ids, failure.getErrorMessage())
+        self._subscribed.difference_update(symbol_ids)
+
+    # --- Specific Message Handlers (called from _on_message_received or _on_response) ---
     def _handle_account_auth_response(self, response: ProtoOAAccountAuthRes):
-        print(f"Received ProtoOAAccountAuthRes: {Protobuf.extract(response)}")
+        log.debug("Received ProtoOAAccountAuthRes: %s", response)
         if response.ctidTraderAccountId == self.ctid_trader_account_id:
-            print(f"Account {self.ctid_trader_account_id} authorized successfully.")
+            log.info("Account %s authorized successfully.", self.ctid_trader_account_id)
             self.is_connected = True # Mark as fully connected after successful account auth
             self._last_error = ""
             # Now request detailed trader info for this account
             self._send_get_trader_request(self.ctid_trader_account_id)
-            # TODO: Subscribe to symbols, etc.
+            self._send_symbols_list_request(self.ctid_trader_account_id)
         else:
             self._last_error = f"Account authorization failed for {self.ctid_trader_account_id}."
-            print(self._last_error)
+            log.error(self._last_error)
             self.is_connected = False
+            self._logon_event.set()
 
-    def _handle_get_account_list_response(self, response: ProtoOAGetAccountListRes):
-        print(f"Received ProtoOAGetAccountListRes: {Protobuf.extract(response)}")
+    def _handle_get_account_list_response(self, response: ProtoOAGetAccountListByAccessTokenRes):
+        log.debug("Received ProtoOAGetAccountListByAccessTokenRes: %s", response)
         if not response.ctidTraderAccount:
-            print("No trading accounts found in the list.")
+            log.warning("No trading accounts found in the list.")
             self._last_error = "No trading accounts found."
             self.is_connected = False # Cannot proceed without an account
+            self._logon_event.set()
             return
 
         if self.ctid_trader_account_id: # If a default was set, ensure it's in the list
             found = any(acc.ctidTraderAccountId == self.ctid_trader_account_id for acc in response.ctidTraderAccount)
             if not found:
-                print(f"Default account ID {self.ctid_trader_account_id} not found in list. Using first available.")
+                log.warning("Default account ID %s not found in list. Using first available.", self.ctid_trader_account_id)
                 self.ctid_trader_account_id = response.ctidTraderAccount[0].ctidTraderAccountId
         else: # No default, use the first one from the list
             self.ctid_trader_account_id = response.ctidTraderAccount[0].ctidTraderAccountId
-            print(f"No default account ID set. Using first available: {self.ctid_trader_account_id}")
+            log.info("No default account ID set. Using first available: %s", self.ctid_trader_account_id)
 
         # Store the account ID in settings if it was determined dynamically
         if self.settings.openapi.default_ctid_trader_account_id != self.ctid_trader_account_id:
              self.settings.openapi.default_ctid_trader_account_id = self.ctid_trader_account_id
              # Consider saving settings, or notifying user
-             print(f"Updated active ctidTraderAccountId to: {self.ctid_trader_account_id}")
+             log.info("Updated active ctidTraderAccountId to: %s", self.ctid_trader_account_id)
 
         # Authenticate the selected account
         self._send_account_auth_request(self.ctid_trader_account_id)
 
     def _handle_trader_response(self, response: ProtoOATraderRes):
-        print(f"Received ProtoOATraderRes: {Protobuf.extract(response)}")
-        trader = response.trader
-        if trader.ctidTraderAccountId == self.ctid_trader_account_id:
-            self.balance = trader.balance / 100.0  # Assuming balance is in cents
-            self.equity = trader.equity / 100.0    # Assuming equity is in cents
-            # Margin calculation might be more complex (freeMargin, marginLevel, etc.)
-            # self.margin = ...
-            self.currency = trader.depositAssetId # This is an asset ID, need to map to currency string
-            # For now, let's assume depositAssetId 1 is USD, 2 EUR etc. - this needs proper mapping
-            asset_map = {1: "USD", 2: "EUR", 3: "GBP"} # Example map
-            self.currency = asset_map.get(trader.depositAssetId, str(trader.depositAssetId))
-            self.account_id = str(trader.ctidTraderAccountId)
-            print(f"Account Summary Updated: AccID: {self.account_id}, Bal: {self.balance} {self.currency}, Eq: {self.equity}")
-        else:
-            print(f"Received ProtoOATraderRes for an unexpected account: {trader.ctidTraderAccountId}")
+        log.debug("Received ProtoOATraderRes: %s", response)
+        if self._apply_trader_update(response.trader, "ProtoOATraderRes") and self.is_connected:
+            self._logon_event.set()
 
     def _handle_trader_updated_event(self, event: ProtoOATraderUpdatedEvent):
-        print(f"Received ProtoOATraderUpdatedEvent: {Protobuf.extract(event)}")
-        # This event provides updates to trader fields like balance, equity etc.
-        trader = event.trader
-        if trader.ctidTraderAccountId == self.ctid_trader_account_id:
-            self.balance = trader.balance / 100.0
-            self.equity = trader.equity / 100.0
-            # self.margin = ...
-            # self.currency = map_asset_id_to_currency(trader.depositAssetId)
-            asset_map = {1: "USD", 2: "EUR", 3: "GBP"} # Example map
-            self.currency = asset_map.get(trader.depositAssetId, str(trader.depositAssetId))
-            self.account_id = str(trader.ctidTraderAccountId)
-            print(f"Account Summary Updated (Event): AccID: {self.account_id}, Bal: {self.balance} {self.currency}, Eq: {self.equity}")
-        else:
-            print(f"Received ProtoOATraderUpdatedEvent for an unexpected account: {trader.ctidTraderAccountId}")
-
+        log.debug("Received ProtoOATraderUpdatedEvent: %s", event)
+        # This event provides updates to trader fields like balance
+        self._apply_trader_update(event.trader, "ProtoOATraderUpdatedEvent")
+
+    def _apply_trader_update(self, trader: Any, source: str) -> bool:
+        # Shared by ProtoOATraderRes and ProtoOATraderUpdatedEvent; False if it's for another account
+        account_id = trader.ctidTraderAccountId
+        if account_id != self.ctid_trader_account_id:
+            log.warning("Received %s for an unexpected account: %s", source, account_id)
+            return False
+        self.balance = trader.balance * _CENT
+        # ProtoOATrader carries no equity; it would have to be derived from open positions
+        # Margin calculation might be more complex (freeMargin, marginLevel, etc.)
+        # self.margin = ...
+        # depositAssetId is an asset ID; this needs a proper mapping (ProtoOAAssetListReq)
+        deposit_asset_id = trader.depositAssetId
+        self.currency = _ASSET_CURRENCIES.get(deposit_asset_id, str(deposit_asset_id))
+        self.account_id = str(account_id)
+        log.info("Account Summary Updated (%s): AccID: %s, Bal: %s %s, Eq: %s", source, self.account_id, self.balance, self.currency, self.equity)
+        return True
+
+
+    def _handle_symbols_list_response(self, response: ProtoOASymbolsListRes):
+        log.info("Received ProtoOASymbolsListRes with %s symbols.", len(response.symbol))
+        for sym in response.symbol:
+            self._symbol_ids[sym.symbolName] = sym.symbolId
+        pending, self._pending_subscriptions = self._pending_subscriptions, set()
+        # Everything requested before the list arrived goes out in a single ProtoOASubscribeSpotsReq
+        names: List[str] = []
+        symbol_ids: List[int] = []
+        for symbol in pending:
+            symbol_id = self._claim_subscription(symbol)
+            if symbol_id is not None:
+                names.append(symbol)
+                symbol_ids.append(symbol_id)
+        if symbol_ids:
+            self.subscribe_to_symbol_prices_batch(names, self.ctid_trader_account_id, symbol_ids)
 
     def _handle_spot_event(self, event: ProtoOASpotEvent):
-        # symbol_id = event.symbolId
-        # bid_price = event.bid / (10**event.digits) if event.HasField("bid") else None
-        # ask_price = event.ask / (10**event.digits) if event.HasField("ask") else None
-        # print(f"Spot Event: SymbolID {symbol_id}, Bid {bid_price}, Ask {ask_price}")
-        # TODO: Map symbolId to symbol string, update self.price_history and self.last_price
-        pass
+        # An absent side reads as 0, which is never a real price, so no HasField probes are needed
+        self._apply_spot(event.symbolId, event.bid or None, event.ask or None)
+
+    def _apply_spot(self, symbol_id: int, bid_points: Optional[int], ask_points: Optional[int]):
+        # bid/ask in 1/100000 price units; None for a side this event didn't carry
+        slot = self._slot_by_id.get(symbol_id)
+        if slot is None:
+            return # Not a symbol subscribed through get_market_price
+        if bid_points is not None:
+            self._bids[slot] = bid_points / SPOT_PRICE_SCALE
+        if ask_points is not None:
+            self._asks[slot] = ask_points / SPOT_PRICE_SCALE
+        bid = self._bids[slot]
+        ask = self._asks[slot]
+        if bid is None and ask is None:
+            return # e.g. a trendbar-only event before any quote
+        if bid is not None and ask is not None:
+            price = (bid + ask) / 2
+        else:
+            price = bid if bid is not None else ask
+        self._mids[slot] = price
+        if slot == self._active_slot:
+            self.price_history.append(price)
+            self._history_snapshot = None
+            self._price_event.set()
+
+    def _clear_quote(self, slot: int):
+        # Forget the slot's last quote; get_market_price returns None until the next tick
+        self._bids[slot] = self._asks[slot] = self._mids[slot] = None
+        if slot == self._active_slot:
+            self._price_event.clear()
 
     def _handle_execution_event(self, event: ProtoOAExecutionEvent):
-        print(f"Received ProtoOAExecutionEvent: {Protobuf.extract(event)}")
+        log.debug("Received ProtoOAExecutionEvent: %s", event)
         # TODO: Process order fills, rejections, etc.
         pass
 
+    def _handle_heartbeat_event(self, event: ProtoHeartbeatEvent):
+        # TcpProtocol answers server heartbeats itself
+        log.debug("Received ProtoHeartbeatEvent from server.")
+
+    def _handle_error_response(self, error: ProtoOAErrorRes):
+        log.error("ERROR_RES: Code=%s, Desc=%s, MaintenanceEnd=%s", error.errorCode, error.description, error.maintenanceEndTimestamp)
+        self._last_error = f"API Error: {error.errorCode} - {error.description}"
+        if not self.is_connected:
+            self._logon_event.set() # Error during the auth chain ends the logon attempt
+
     # --- Request Sending Methods ---
     def _send_account_auth_request(self, ctid_trader_account_id: int):
         if not self._is_client_connected or not self._client:
             self._last_error = "Cannot send AccountAuthReq: Client not connected."
-            print(self._last_error)
+            log.error(self._last_error)
+            return
+
+        if not self._has_access_token():
             return
 
         acc_auth_req = ProtoOAAccountAuthReq()
         acc_auth_req.ctidTraderAccountId = ctid_trader_account_id
-        # accessToken is for a different OAuth flow (trading account access token, not app access token)
-        # For app-level client ID/secret auth, this is usually not needed here.
-        # If OpenApiPy requires it, it might have a different way to set it.
-        # The example implies app auth (clientid/secret) is primary.
-        # acc_auth_req.accessToken = "AN_ACCOUNT_SPECIFIC_ACCESS_TOKEN_IF_NEEDED"
+        # The account-level OAuth token; clientId/secret only authorize the application
+        acc_auth_req.accessToken = self.settings.openapi.access_token
 
-        print(f"Sending ProtoOAAccountAuthReq for ctidTraderAccountId: {ctid_trader_account_id}")
-        deferred = self._client.send(acc_auth_req)
-        # Callbacks for ProtoOAAccountAuthRes are handled in _on_message_received
-        deferred.addErrback(self._handle_send_error)
+        log.info("Sending ProtoOAAccountAuthReq for ctidTraderAccountId: %s", ctid_trader_account_id)
+        deferred = self._client.send(acc_auth_req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addCallbacks(self._on_response, self._handle_send_error,
+                              callbackArgs=(self._handle_account_auth_response,), errbackArgs=(self._connection_gen,))
 
     def _send_get_account_list_request(self):
         if not self._is_client_connected or not self._client:
-            self._last_error = "Cannot send GetAccountListReq: Client not connected."
-            print(self._last_error)
+            self._last_error = "Cannot send GetAccountListByAccessTokenReq: Client not connected."
+            log.error(self._last_error)
             return
 
-        req = ProtoOAGetAccountListReq()
-        # This request might need an access token if it's a different OAuth flow,
-        # but typically after app auth, this is allowed.
-        # req.accessToken = "APP_ACCESS_TOKEN_IF_NEEDED_HERE"
-        print("Sending ProtoOAGetAccountListReq...")
-        deferred = self._client.send(req)
-        deferred.addErrback(self._handle_send_error)
+        if not self._has_access_token():
+            return
+
+        req = ProtoOAGetAccountListByAccessTokenReq()
+        req.accessToken = self.settings.openapi.access_token
+        log.info("Sending ProtoOAGetAccountListByAccessTokenReq...")
+        deferred = self._client.send(req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addCallbacks(self._on_response, self._handle_send_error,
+                              callbackArgs=(self._handle_get_account_list_response,), errbackArgs=(self._connection_gen,))
+
+    def _has_access_token(self) -> bool:
+        # accessToken is a required field of both account requests; without it the message can't be serialized
+        if self.settings.openapi.access_token:
+            return True
+        self._last_error = "Access token not configured (CTRADER_ACCESS_TOKEN or config.json). Cannot authorize an account."
+        log.error(self._last_error)
+        self.is_connected = False
+        self._logon_event.set()
+        return False
 
     def _send_get_trader_request(self, ctid_trader_account_id: int):
         if not self._is_client_connected or not self._client:
-            self._last_error = "Cannot send GetTraderReq: Client not connected."
-            print(self._last_error)
+            self._last_error = "Cannot send TraderReq: Client not connected."
+            log.error(self._last_error)
             return
 
-        req = ProtoOAGetTraderReq()
+        req = ProtoOATraderReq()
         req.ctidTraderAccountId = ctid_trader_account_id
-        print(f"Sending ProtoOAGetTraderReq for account {ctid_trader_account_id}...")
-        deferred = self._client.send(req)
-        deferred.addErrback(self._handle_send_error)
+        log.info("Sending ProtoOATraderReq for account %s...", ctid_trader_account_id)
+        deferred = self._client.send(req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addCallbacks(self._on_response, self._handle_send_error,
+                              callbackArgs=(self._handle_trader_response,), errbackArgs=(self._connection_gen,))
 
-    def _send_ping_request(self):
+    def _send_symbols_list_request(self, ctid_trader_account_id: int):
         if not self._is_client_connected or not self._client:
-            return # Silently fail if not connected for ping
+            self._last_error = "Cannot send SymbolsListReq: Client not connected."
+            log.error(self._last_error)
+            return
 
-        ping_req = ProtoPingReq()
-        ping_req.timestamp = int(time.time() * 1000)
-        # clientMsgId is optional for PingReq based on some OpenApi.proto files
-        # If the library adds it, or if it's needed, set it:
-        # ping_req.clientMsgId = self._next_message_id()
-        print(f"Sending ProtoPingReq (Timestamp: {ping_req.timestamp})")
-        deferred = self._client.send(ping_req)
-        deferred.addErrback(self._handle_send_error) # Log if ping send fails
+        req = ProtoOASymbolsListReq()
+        req.ctidTraderAccountId = ctid_trader_account_id
+        log.info("Sending ProtoOASymbolsListReq for account %s...", ctid_trader_account_id)
+        deferred = self._client.send(req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addCallbacks(self._on_response, self._handle_send_error,
+                              callbackArgs=(self._handle_symbols_list_response,), errbackArgs=(self._connection_gen,))
 
 
     # --- Public Interface ---
     def connect(self) -> bool:
-        if not USE_OPENAPI_LIB:
+        if not _ensure_openapi():
             self._last_error = "ctrader-open-api library not installed."
-            print(self._last_error)
+            log.error(self._last_error)
             # Simulate mock connection for GUI if needed
             self.is_connected = True
+            self._logon_event.set()
             return True # Or False if strict failure is desired
 
-        if self.is_connected or (self._client and self._client.connected): # self._client.connected might be internal
-            print("Already connected or connection attempt in progress.")
+        # _is_client_connected is maintained by the client callbacks; no need to probe the client itself
+        if self._is_client_connected and not self.is_connected and self._logon_event.is_set():
+            # The last auth chain failed with TCP still up (error reply, rejected account, send timeout).
+            # Start it over on the open connection instead of reporting that outcome again.
+            log.info("Retrying authorization on the open connection...")
+            self._logon_event.clear()
+            self._on_client_connected(self._client)
+            return True
+        if self.is_connected or self._is_client_connected:
+            log.info("Already connected or connection attempt in progress.")
             return True
 
         if not self._client:
-            self._last_error = "OpenApiPy Client not initialized."
-            print(self._last_error)
+            self._client = self._create_client()
+
+        # The reactor is owned by the caller (main.py drives it through tksupport together with
+        # the Tk loop); the client's network events are only processed while it runs
+        if not (_reactor_installed and reactor.running): # type: ignore
+            log.critical("Twisted reactor is not running. Network operations will not proceed.")
+            self._last_error = "Twisted reactor not available or not running."
             return False
 
         try:
-            print("Starting OpenApiPy Client service...")
+            log.info("Starting OpenApiPy Client service...")
+            self._logon_event.clear()
             self._client.startService() # This starts the connection attempt
 
-            # The Twisted reactor needs to run for network events.
-            # For GUI apps, this is tricky. If tksupport is installed,
-            # it might integrate with Tkinter's mainloop.
-            # Otherwise, run reactor in a separate thread.
-            if _reactor_installed:
-                if not reactor.running: # type: ignore
-                    # This case implies tksupport might be installed but reactor.run() wasn't called from main.
-                    # This could happen if main.py's tksupport integration fails or is bypassed.
-                    # Starting reactor in a thread here is a fallback.
-                    if self._reactor_thread is None or not self._reactor_thread.is_alive():
-                        self._reactor_thread = threading.Thread(target=lambda: reactor.run(installSignalHandlers=0), daemon=True) # type: ignore
-                        self._reactor_thread.start()
-                        print("Twisted reactor started in a separate thread by Trader class (tksupport might not be driving from main).")
-                else:
-                    # Reactor is already running (presumably driven by tksupport in main thread via main.py's reactor.run())
-                    print("Twisted reactor is already running (likely integrated with GUI main loop). Trader will use existing reactor.")
-            elif not _reactor_installed: # Should ideally be _reactor_installed is False, or reactor is None
-                print("CRITICAL WARNING: Twisted reactor support not found or not running. Network operations will not proceed.")
-                self._last_error = "Twisted reactor not available or not running."
-                # self._client.stopService() # Clean up if reactor can't run. This might also need reactor.
-                return False
-
             # Connection status (self.is_connected) will be set by callbacks.
             # This connect method now initiates the process.
             # We can't immediately know if it's successful here due to async nature.
             # For now, return True optimistically, status check should be used by UI.
-            print("Connection process initiated. Status will be updated by callbacks.")
+            log.info("Connection process initiated. Status will be updated by callbacks.")
             return True
 
         except Exception as e:
             self._last_error = f"Failed to start OpenApiPy Client service: {e}"
-            print(self._last_error)
+            log.error(self._last_error)
             # import traceback
             # traceback.print_exc()
             self.is_connected = False
             return False
 
     def disconnect(self):
-        print("Disconnecting trader (OpenApiPy)...")
+        log.info("Disconnecting trader (OpenApiPy)...")
         if self._client:
             self._client.stopService() # This should trigger _on_client_disconnected
 
-        # Reactor shutdown is complex.
-        # Only stop the reactor if this Trader instance started it in a separate thread.
-        # If tksupport is managing the reactor via main.py, Trader should not stop it globally.
-        if self._reactor_thread and self._reactor_thread.is_alive():
-            if _reactor_installed and reactor.running: # type: ignore
-                print("Requesting Twisted reactor (started by Trader) to stop...")
-                reactor.callFromThread(reactor.stop) # type: ignore
-                self._reactor_thread.join(timeout=5)
-                if self._reactor_thread.is_alive():
-                    print("Warning: Reactor thread (started by Trader) did not stop.")
-                else:
-                    print("Reactor thread (started by Trader) stopped.")
-            else:
-                print("Reactor thread exists but reactor is not running or tksupport missing; cannot stop cleanly from here.")
-        elif _reactor_installed and reactor.running: # type: ignore
-             print("Trader disconnecting. Assuming Twisted reactor is managed externally (e.g., by tksupport in main GUI thread) and will not be stopped by Trader.")
-
-        self._reactor_thread = None # Clear the thread reference in any case
+        # The reactor belongs to the caller and keeps running for the GUI; it is not stopped here
 
         self.is_connected = False
         self._is_client_connected = False
-        print("Trader disconnected (OpenApiPy).")
+        log.info("Trader disconnected (OpenApiPy).")
+
 
+    def wait_for_logon(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the current connection attempt has succeeded or failed.
+
+        Returns False if it is still in progress after `timeout` seconds. Use timeout=0 on the
+        reactor thread (the GUI's), where blocking would prevent the auth callbacks from running.
+        """
+        return self._logon_event.wait(timeout)
 
     def get_connection_status(self):
         # self.is_connected is set by callbacks after successful account auth
@@ -417,28 +628,8 @@ class Trader:
         # UI might want to distinguish between "connecting", "app authorized", "account authorized"
         return self.is_connected, self._last_error
 
-    def start_heartbeat(self):
-        # With OpenApiPy, ProtoHeartbeatEvent is received.
-        # We might need to send ProtoPingReq periodically if server expects client pings.
-        # The library example doesn't explicitly show client sending pings,
-        # but it's common in Protobuf APIs over TCP to ensure connection liveness.
-        # Let's add a periodic ping sender.
-        if USE_OPENAPI_LIB and self.is_connected: # Check full connection
-             # This should be managed by the Twisted reactor loop using LoopingCall
-            if _reactor_installed:
-                from twisted.internet.task import LoopingCall
-                lc = LoopingCall(self._send_ping_request)
-                # Start pinging e.g. every 30 seconds. Store lc to stop it on disconnect.
-                # self._ping_lc = lc
-                # lc.start(30)
-                print("Periodic Ping mechanism ready to be started (e.g. via LoopingCall).")
-            else:
-                print("Twisted LoopingCall not available for periodic ping.")
-        pass
-
-
     def get_account_summary(self) -> dict:
-        if not USE_OPENAPI_LIB:
+        if USE_OPENAPI_LIB is False:
              return {"account_id": "MOCK_LIB_DISABLED", "balance": 0.0, "equity": 0.0, "margin": 0.0, "currency": "N/A"}
 
         if not self.is_connected: # This now means fully connected (app + account auth)
@@ -446,8 +637,6 @@ class Trader:
             status_detail = "Not connected."
             if self._is_client_connected:
                 status_detail = "Connecting (authorizing account)..."
-            elif self._client and self._client.connected: # Should not happen if _is_client_connected is false
-                 status_detail = "Connecting (OpenApiPy client connected, app auth pending)..."
 
             # For GUI, it might be better to return fetching status rather than raise error here
             # if connection attempt is underway.
@@ -469,45 +658,112 @@ class Trader:
             return {"account_id": "Fetching details...", "balance": None, "equity": None, "margin": None, "currency": None}
 
 
-    def get_market_price(self, symbol: str) -> float:
-        if not USE_OPENAPI_LIB:
-            return round(random.uniform(1.10, 1.20) + random.uniform(-0.005, 0.005), 5)
+    def get_market_price(self, symbol: str, timeout: float = 0.0) -> Optional[float]:
+        # Returns None while connected but before the first quote for symbol has arrived
+        if USE_OPENAPI_LIB is False:
+            return round(1.095 + self._rng.random() * 0.11, 5) # Mock: one draw over the old 1.095-1.205 span
 
         if not self.is_connected:
             raise RuntimeError("Cannot fetch market data: Not connected to cTrader Open API.")
 
-        # TODO: Implement self.last_price dictionary updated by _handle_spot_event
-        # This requires mapping symbol string to symbolId and vice-versa.
-        # For now, returning placeholder.
-        if self.price_history: # This is not symbol specific yet
-            return self.price_history[-1]
-        else:
-            print(f"Market price for {symbol} not yet available from stream. Consider subscribing.")
-            # self.subscribe_to_symbol_openapi(symbol) # This needs to be async or scheduled with reactor
-            return round(random.uniform(1.10, 1.20) + random.uniform(-0.005, 0.005), 5) # Mock
+        if symbol != self._active_symbol:
+            # Strategies read price_history as one series, so it follows the symbol being priced
+            self._active_symbol = symbol
+            self.price_history.clear()
+            self._history_snapshot = None
+            self._price_event.clear()
+        # The subscription bookkeeping is shared with the spot and symbol-list handlers, so it only
+        # runs on the reactor thread. callFromThread is safe from there and from worker threads alike;
+        # the read-only membership test just saves a reactor wake-up per price read once subscribed.
+        if self._symbol_ids.get(symbol) not in self._subscribed:
+            reactor.callFromThread(self._ensure_subscribed, symbol) # type: ignore
+        slot = self._active_slot = self._slot_by_name.get(symbol)
+        price = self._mids[slot] if slot is not None else None
+
+        # Callers off the reactor thread may wait for the first spot event instead of getting None.
+        # The GUI calls this on the reactor thread (tksupport) and must keep the default timeout=0,
+        # since blocking there would stop the very event it's waiting for from being delivered.
+        if price is None and timeout > 0 and self._price_event.wait(timeout):
+            slot = self._slot_by_name.get(symbol)
+            price = self._mids[slot] if slot is not None else None
+
+        if price is None:
+            # No made-up price in live mode: a strategy fed random quotes would trade on them
+            log.debug("Market price for %s not yet available from stream.", symbol)
+        return price
+
+    def _ensure_subscribed(self, symbol: str):
+        # Spots are subscribed once per symbol and then streamed; repeated price reads send nothing.
+        # Reactor thread only, like every other user of _subscribed and the price slots.
+        symbol_id = self._claim_subscription(symbol)
+        if symbol_id is not None:
+            self.subscribe_to_symbol_prices(symbol, self.ctid_trader_account_id, symbol_id)
+
+    def _claim_subscription(self, symbol: str) -> Optional[int]:
+        # Returns the symbolId still to be subscribed, after giving it a price slot, or None
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            self._pending_subscriptions.add(symbol) # Subscribed once ProtoOASymbolsListRes arrives
+        elif symbol_id not in self._subscribed and _reactor_installed:
+            self._subscribed.add(symbol_id)
+            if symbol_id not in self._slot_by_id:
+                slot = len(self._mids)
+                self._slot_by_id[symbol_id] = slot
+                self._slot_by_name[symbol] = slot
+                self._bids.append(None)
+                self._asks.append(None)
+                self._mids.append(None)
+                if symbol == self._active_symbol:
+                    self._active_slot = slot
+            return symbol_id
+        return None
 
     def subscribe_to_symbol_prices(self, symbol_name: str, ctid_account_id: int, symbol_id: int):
-        """ Helper to send ProtoOASubscribeSpotsReq """
+        """ Helper to send ProtoOASubscribeSpotsReq for a single symbol """
+        self.subscribe_to_symbol_prices_batch([symbol_name], ctid_account_id, [symbol_id])
+
+    def subscribe_to_symbol_prices_batch(self, symbol_names: List[str], ctid_account_id: int, symbol_ids: List[int]):
+        """ Helper to send one ProtoOASubscribeSpotsReq for all of symbol_ids """
         if not self._is_client_connected or not self._client:
-            print("Cannot subscribe: Client not connected.")
+            log.warning("Cannot subscribe: Client not connected.")
             return
 
         req = ProtoOASubscribeSpotsReq()
         req.ctidTraderAccountId = ctid_account_id
-        req.symbolId.append(symbol_id)
+        req.symbolId.extend(symbol_ids)
         # clientMsgId can be added if needed for tracking this specific request's ack/nack
         # req.clientMsgId = self._next_message_id()
 
-        print(f"Sending ProtoOASubscribeSpotsReq for account {ctid_account_id}, symbolId {symbol_id} ({symbol_name})")
-        deferred = self._client.send(req)
-        # Callback for ProtoOASubscribeSpotsRes can be handled in _on_message_received
-        # or by attaching callbacks to this deferred if the response is direct.
-        deferred.addErrback(self._handle_send_error)
+        log.info("Sending ProtoOASubscribeSpotsReq for account %s, symbolIds %s (%s)", ctid_account_id, symbol_ids, ", ".join(symbol_names))
+        deferred = self._client.send(req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        # ProtoOASubscribeSpotsRes carries nothing; the spot events that follow are the real acknowledgement
+        deferred.addErrback(self._handle_subscription_error, symbol_ids, self._connection_gen)
+
+
+    def unsubscribe_from_symbol_prices(self, symbol_name: str):
+        """ Helper to send ProtoOAUnsubscribeSpotsReq for a symbol subscribed via get_market_price """
+        symbol_id = self._symbol_ids.get(symbol_name)
+        self._pending_subscriptions.discard(symbol_name)
+        if symbol_id is None or symbol_id not in self._subscribed:
+            return
+        self._subscribed.discard(symbol_id)
+        slot = self._slot_by_id.get(symbol_id)
+        if slot is not None:
+            self._clear_quote(slot) # No more ticks will update it
+        if not self._is_client_connected or not self._client:
+            return
+
+        req = ProtoOAUnsubscribeSpotsReq()
+        req.ctidTraderAccountId = self.ctid_trader_account_id
+        req.symbolId.append(symbol_id)
+        log.info("Sending ProtoOAUnsubscribeSpotsReq for symbolId %s (%s)", symbol_id, symbol_name)
+        deferred = self._client.send(req, responseTimeoutInSeconds=RESPONSE_TIMEOUT_S)
+        deferred.addErrback(self._handle_subscription_error, [symbol_id], self._connection_gen)
 
 
     def place_market_order(self, symbol: str, side: str, size_in_lots: float, tp_pips: Optional[float], sl_pips: Optional[float]):
-        if not USE_OPENAPI_LIB:
-            print(f"[MOCK ORDER OpenApiPy] {side.upper()} {symbol} size={size_in_lots} TP_pips={tp_pips} SL_pips={sl_pips}")
+        if USE_OPENAPI_LIB is False:
+            log.info("[MOCK ORDER OpenApiPy] %s %s size=%s TP_pips=%s SL_pips=%s", side.upper(), symbol, size_in_lots, tp_pips, sl_pips)
             return
 
         if not self.is_connected or not self.ctid_trader_account_id:
@@ -521,12 +777,12 @@ class Trader:
         # 3. Convert tp_pips/sl_pips to absolute price levels or relative pips as API expects.
         #    This requires knowing current price and pip value for the symbol.
 
-        print(f"Placeholder: place_market_order_openapi({symbol}, {side}, {size_in_lots}) called.")
+        log.info("Placeholder: place_market_order_openapi(%s, %s, %s) called.", symbol, side, size_in_lots)
         # Example:
         # order_req = ProtoOANewOrderReq()
         # order_req.ctidTraderAccountId = self.ctid_trader_account_id
         # order_req.symbolId = ... (lookup)
-        # order_req.orderType = MARKET
+        # order_req.orderType = ProtoOAOrderType.MARKET
         # order_req.tradeSide = ProtoOATradeSide.BUY if side.lower() == 'buy' else ProtoOATradeSide.SELL
         # order_req.volume = int(size_in_lots * 100000) # Example: 1 lot = 100000 units
         # if sl_pips: order_req.stopLoss = ... (calculate absolute price)
@@ -538,5 +794,9 @@ class Trader:
         #    deferred.addErrback(self._handle_send_error)
         pass
 
-    def get_price_history(self) -> List[float]:
-        return list(self.price_history)
+    def get_price_history(self) -> Sequence[float]:
+        # Immutable snapshot shared between callers; only rebuilt after the history changes
+        snapshot = self._history_snapshot
+        if snapshot is None:
+            snapshot = self._history_snapshot = tuple(self.price_history)
+        return snapshot